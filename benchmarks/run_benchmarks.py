@@ -0,0 +1,421 @@
+"""
+Benchmarks for the hot path of every example. Each benchmark generates its
+own synthetic data, so the suite runs offline, and measures latency
+percentiles (over samples that each average several calls), throughput and
+peak traced memory at several scales.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --threshold 0.2
+
+The `quick` preset runs in about a minute. `--preset full` sweeps 10K to 100M
+rows, 1 to 10K observers and 1 to 64 threads. With `--baseline`, the run fails
+if any path got slower (p50) or used more memory than the baseline by more
+than `--threshold`, and baseline paths this run could not measure are listed.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+EXAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "examples"
+)
+for pattern_dir in (
+    "behavioural_patterns",
+    "creational_patterns",
+    "structural_patterns",
+):
+    sys.path.insert(0, os.path.join(EXAMPLES_DIR, pattern_dir))
+
+PRESETS = {
+    "quick": {"rows": [10_000, 100_000], "observers": [1, 100], "threads": [1, 8]},
+    "full": {
+        "rows": [10_000, 1_000_000, 100_000_000],
+        "observers": [1, 100, 10_000],
+        "threads": [1, 8, 64],
+    },
+}
+
+# Memory below this is noise, so it is never reported as a regression.
+MIN_TRACKED_BYTES = 1024 * 1024
+# Likewise, a p50 that grew by less than this is never reported.
+MIN_LATENCY_DELTA_S = 50e-6
+# Each timing sample repeats the path until it lasts at least this long.
+MIN_SAMPLE_S = 0.01
+# Slow paths stop sampling after this long, with at least MIN_SAMPLES samples.
+MAX_PATH_S = 10.0
+MIN_SAMPLES = 5
+
+Benchmark = Callable[[int], ContextManager[Tuple[Callable[[], Any], int]]]
+
+
+@contextmanager
+def quiet() -> Iterator[None]:
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
+"""
+Each benchmark is a context manager that takes a scale, prepares the data and
+yields the function to time together with the number of items it processes.
+"""
+
+
+@contextmanager
+def csv_iteration(rows: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    import pandas as pd
+    from iterator import MultipleCSV
+
+    with tempfile.TemporaryDirectory() as csv_dir:
+        n_files = 10
+        for index, chunk in enumerate(np.array_split(np.arange(rows), n_files)):
+            path = os.path.join(csv_dir, f"part_{index}.csv")
+            pd.DataFrame({"column": chunk}).to_csv(path, index=False)
+
+        yield (lambda: sum(MultipleCSV(csv_dir))), rows
+
+
+@contextmanager
+def strategy_scalers(rows: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    from strategy import ContinuousVariableFeatureEngineering, Normalize, Standardize
+
+    data = np.random.default_rng(0).normal(size=(rows, 4))
+    context = ContinuousVariableFeatureEngineering(Normalize())
+
+    def run() -> None:
+        for strategy in (Normalize(), Standardize()):
+            context.strategy = strategy
+            context.process(data)
+
+    yield run, rows
+
+
+@contextmanager
+def observer_notify(observers: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    from observer import RainyObserver, TornadoObserver, WeatherPredictionMonitor
+
+    subject = WeatherPredictionMonitor()
+    # The observer list is a class attribute, so give every scale its own.
+    subject._observers = []
+    subject._prediction_today = "Sunny"
+    with quiet():
+        for index in range(observers):
+            subject.attach(RainyObserver() if index % 2 else TornadoObserver())
+
+    def run() -> None:
+        with quiet():
+            subject.notify()
+
+    yield run, observers
+
+
+@contextmanager
+def singleton_contention(threads: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    from singleton import DBConnection
+
+    calls_per_thread = 10_000
+
+    def lookups() -> None:
+        for _ in range(calls_per_thread):
+            DBConnection()
+
+    def run() -> None:
+        workers = [threading.Thread(target=lookups) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    yield run, threads * calls_per_thread
+
+
+class ArrayDataLoader:
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+
+    def get_all_data(self) -> np.ndarray:
+        return self.data
+
+
+@contextmanager
+def adapter_splits(rows: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    from adapter import Adapter, iter_batches
+
+    loader = ArrayDataLoader(np.arange(rows, dtype=np.int64))
+
+    def run() -> None:
+        adapter = Adapter(loader, fractions=(0.8, 0.1, 0.1))
+        for split in (
+            adapter.get_train_data(),
+            adapter.get_val_data(),
+            adapter.get_test_data(),
+        ):
+            for batch in iter_batches(split, 65_536):
+                batch.sum()
+
+    yield run, rows
+
+
+@contextmanager
+def adapter_shuffled_batches(rows: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+    from adapter import Adapter, iter_batches
+
+    loader = ArrayDataLoader(np.arange(rows, dtype=np.int64))
+
+    def run() -> None:
+        adapter = Adapter(loader, fractions=(0.8, 0.1, 0.1), shuffle=True, seed=0)
+        for batch in iter_batches(adapter.get_train_data(), 65_536):
+            batch.sum()
+
+    yield run, rows
+
+
+def _pipeline_benchmark(profiled: bool) -> Benchmark:
+    @contextmanager
+    def benchmark(rows: int) -> Iterator[Tuple[Callable[[], Any], int]]:
+        from builder import ModelPipeline, PipelineProfiler
+
+        def load_rows(_: Any) -> np.ndarray:
+            return np.arange(rows, dtype=np.int64)
+
+        def scale_rows(data: np.ndarray) -> np.ndarray:
+            return data * 2
+
+        pipeline = ModelPipeline()
+        pipeline.add(load_rows)
+        pipeline.add(scale_rows)
+
+        def run() -> None:
+            with quiet():
+                pipeline.run(profiler=PipelineProfiler() if profiled else None)
+
+        yield run, rows
+
+    return benchmark
+
+
+"""
+The benchmarks, the scale each one sweeps and the largest scale each one can
+handle in reasonable time and memory.
+"""
+BENCHMARKS: List[Tuple[str, Benchmark, str, Optional[int]]] = [
+    ("csv_iteration", csv_iteration, "rows", 1_000_000),
+    ("strategy_scalers", strategy_scalers, "rows", 10_000_000),
+    ("observer_notify", observer_notify, "observers", None),
+    ("singleton_contention", singleton_contention, "threads", None),
+    ("adapter_splits", adapter_splits, "rows", None),
+    ("adapter_shuffled_batches", adapter_shuffled_batches, "rows", None),
+    ("pipeline_run", _pipeline_benchmark(profiled=False), "rows", None),
+    ("pipeline_run_profiled", _pipeline_benchmark(profiled=True), "rows", None),
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def autorange(run: Callable[[], Any]) -> int:
+    """
+    Find how many calls make a sample last at least `MIN_SAMPLE_S`, in the
+    1, 2, 5, 10, ... steps `timeit.Timer.autorange` uses.
+    """
+    loops = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            number = loops * multiplier
+            start = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - start >= MIN_SAMPLE_S:
+                return number
+        loops *= 10
+
+
+def measure(run: Callable[[], Any], items: int, repeat: int) -> Dict[str, Any]:
+    """
+    Time `repeat` samples, each averaging `loops` calls to smooth out timer
+    noise on fast paths, then trace memory in one extra call so that
+    tracemalloc does not slow down the timed ones.
+
+    The percentiles are over the per-call means of the samples, not over
+    single calls: with `loops` above 1, the tail of individual calls is
+    averaged away. Paths slow enough to exceed `MAX_PATH_S` take fewer
+    samples; `samples` records how many.
+    """
+    # Warm up first, or one-off setup costs make autorange settle on too few
+    # calls per sample.
+    run()
+    loops = autorange(run)
+    times = []
+    deadline = time.perf_counter() + MAX_PATH_S
+    while len(times) < repeat:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        times.append((time.perf_counter() - start) / loops)
+        if len(times) >= MIN_SAMPLES and time.perf_counter() > deadline:
+            break
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50 = percentile(times, 0.5)
+    return {
+        "items": items,
+        "samples": len(times),
+        "loops": loops,
+        "mean_s": sum(times) / len(times),
+        "sample_p50_s": p50,
+        "sample_p95_s": percentile(times, 0.95),
+        "sample_p99_s": percentile(times, 0.99),
+        "throughput_per_s": items / p50 if p50 else math.inf,
+        "peak_traced_bytes": peak,
+    }
+
+
+def run_all(
+    scales: Dict[str, List[int]], repeat: int, only: Optional[List[str]]
+) -> Dict[str, Any]:
+    results, skipped = {}, {}
+    for name, benchmark, scale_name, max_scale in BENCHMARKS:
+        if only and name not in only:
+            continue
+        for scale in scales[scale_name]:
+            key = f"{name}[{scale_name}={scale}]"
+            if max_scale is not None and scale > max_scale:
+                skipped[key] = f"{scale_name} above {max_scale}"
+                continue
+            try:
+                with benchmark(scale) as (run, items):
+                    results[key] = measure(run, items, repeat)
+            except ImportError as error:
+                skipped[key] = f"missing dependency: {error.name}"
+                continue
+            result = results[key]
+            print(
+                f"{key:<48} p50 {result['sample_p50_s'] * 1e3:10.3f} ms  "
+                f"p99 {result['sample_p99_s'] * 1e3:10.3f} ms  "
+                f"{result['throughput_per_s']:14,.0f} items/s  "
+                f"peak {result['peak_traced_bytes'] / 2**20:9.1f} MiB"
+            )
+    for key, reason in skipped.items():
+        print(f"{key:<48} skipped: {reason}")
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Return one message per path whose p50 latency or peak memory grew by more
+    than `threshold` (a fraction) over the baseline. Latency must also grow by
+    `MIN_LATENCY_DELTA_S` and beyond the baseline's p95, and peaks below
+    `MIN_TRACKED_BYTES` are ignored.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        p50, previous_p50 = result["sample_p50_s"], previous["sample_p50_s"]
+        # Only a median above the baseline's own p95 is outside its noise.
+        limit = max(
+            previous_p50 * (1 + threshold),
+            previous_p50 + MIN_LATENCY_DELTA_S,
+            previous["sample_p95_s"],
+        )
+        if p50 > limit:
+            regressions.append(
+                f"{key}: p50 {previous_p50 * 1e3:.3f} ms -> {p50 * 1e3:.3f} ms"
+            )
+        peak, previous_peak = result["peak_traced_bytes"], previous["peak_traced_bytes"]
+        if peak > MIN_TRACKED_BYTES and peak > previous_peak * (1 + threshold):
+            regressions.append(
+                f"{key}: peak memory {previous_peak / 2**20:.1f} MiB -> "
+                f"{peak / 2**20:.1f} MiB"
+            )
+    return regressions
+
+
+def missing(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Return one message per baseline path that this run did not measure, for
+    the benchmarks this run covered. Such paths cannot be checked at all.
+    """
+    covered = {key.split("[")[0] for key in (*current["results"], *current["skipped"])}
+    messages = []
+    for key in baseline["results"]:
+        if key in current["results"] or key.split("[")[0] not in covered:
+            continue
+        reason = current["skipped"].get(key, "scale not run")
+        messages.append(f"{key}: {reason}")
+    return messages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--preset", choices=PRESETS, default="quick")
+    parser.add_argument("--rows", type=int, nargs="+", help="override the row scales")
+    parser.add_argument("--observers", type=int, nargs="+")
+    parser.add_argument("--threads", type=int, nargs="+")
+    parser.add_argument("--only", nargs="+", help="benchmark names to run")
+    # With 100 samples, p99 is the second largest rather than the maximum.
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    scales = dict(PRESETS[args.preset])
+    for scale_name in ("rows", "observers", "threads"):
+        if getattr(args, scale_name):
+            scales[scale_name] = getattr(args, scale_name)
+
+    current = run_all(scales, args.repeat, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for field in ("python", "machine"):
+            if baseline.get(field) != current[field]:
+                print(
+                    f"WARNING baseline {field} {baseline.get(field)} differs from "
+                    f"{current[field]}, timings may not be comparable"
+                )
+        for message in missing(current, baseline):
+            print(f"MISSING {message}")
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
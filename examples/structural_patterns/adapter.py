@@ -1,4 +1,10 @@
-from typing import List
+from bisect import bisect_right
+from collections.abc import Sequence
+from functools import cached_property
+from itertools import accumulate
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 
 class DataLoader:
@@ -23,28 +29,240 @@ class AdapteeDataLoader:
     client code can use it.
     """
 
-    def get_all_data(self) -> str:
+    def get_all_data(self) -> List[int]:
         return [0, 1, 2, 3, 4, 5, 6, 7, 8]
 
 
+class DataView(Sequence):
+    """
+    A read-only window on the rows of `data` selected by `indices`. Nothing is
+    copied: the view keeps a reference to the source and a `range` (or any
+    other sequence of row positions) and looks rows up on access.
+    """
+
+    def __init__(self, data: Sequence, indices: Sequence[int]) -> None:
+        self._data = data
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            return DataView(self._data, self._indices[key])
+        index = self._indices[key]
+        if hasattr(self._data, "iloc"):
+            # pandas indexes by label (or column), rows are looked up by position.
+            return self._data.iloc[index]
+        if hasattr(self._data, "column_names"):
+            # Indexing an Arrow table selects a column, so slice out the row.
+            return self._data.slice(int(index), 1).to_pylist()[0]
+        return self._data[index]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def batches(self, batch_size: int) -> Iterator[Any]:
+        """
+        Gather the rows `batch_size` at a time, so at most one batch is ever
+        copied out of the source. NumPy sources are fancy-indexed.
+        """
+        for start in range(0, len(self), batch_size):
+            indices = self._indices[start : start + batch_size]
+            if isinstance(indices, IndexChain):
+                indices = np.concatenate([np.asarray(part) for part in indices.parts])
+            indices = np.asarray(indices, dtype=np.intp)
+            if hasattr(self._data, "__array_interface__"):
+                yield self._data[indices]
+            elif hasattr(self._data, "take"):
+                yield self._data.take(indices)
+            else:
+                yield [self._data[index] for index in indices.tolist()]
+
+
+class IndexChain(Sequence):
+    """
+    The concatenation of several index sequences, without copying them. Used
+    for k-fold training sets, which are the index order minus one fold.
+    """
+
+    def __init__(self, *parts: Sequence[int]) -> None:
+        self.parts = parts
+        self._ends = list(accumulate(len(part) for part in parts))
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self[index] for index in range(start, stop, step)]
+            parts = []
+            for part, end in zip(self.parts, self._ends):
+                begin = end - len(part)
+                if begin < stop and start < end:
+                    parts.append(part[max(start - begin, 0) : min(stop, end) - begin])
+            return IndexChain(*parts)
+
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("IndexChain index out of range")
+        part = bisect_right(self._ends, key)
+        begin = self._ends[part] - len(self.parts[part])
+        return self.parts[part][key - begin]
+
+
+def make_view(data: Any, start: int, stop: int) -> Sequence:
+    """
+    NumPy arrays already slice into views, pandas objects are sliced by
+    position, Arrow tables and arrays have a zero-copy `slice`, and buffer
+    objects (`array.array`, `bytearray`, ...) can be sliced through a
+    memoryview. Everything else, e.g. a Python list, gets a range-backed
+    `DataView`.
+
+    A memoryview keeps the buffer protocol, so NumPy and friends can use it
+    without copying, but it prints as `<memory at 0x...>`; call `tolist()` on
+    it for a readable (copied) list.
+    """
+    if hasattr(data, "__array_interface__"):
+        return data[start:stop]
+    if hasattr(data, "iloc"):
+        return data.iloc[start:stop]
+    if hasattr(data, "slice"):
+        return data.slice(start, stop - start)
+    try:
+        return memoryview(data)[start:stop]
+    except TypeError:
+        return DataView(data, range(start, stop))
+
+
+def iter_batches(split: Sequence, batch_size: int) -> Iterator[Any]:
+    """
+    Yield any split `batch_size` rows at a time, whatever type the Adapter
+    returned for it. Contiguous splits are cut into views; index-backed
+    `DataView` splits gather one batch at a time.
+    """
+    if isinstance(split, DataView):
+        yield from split.batches(batch_size)
+        return
+    for start in range(0, len(split), batch_size):
+        yield make_view(split, start, min(start + batch_size, len(split)))
+
+
 class Adapter(DataLoader):
     """
     The Adapter makes the Adaptee's interface compatible with the Target's
     interface via composition.
+
+    The data is only fetched from the Adaptee when a split is first requested,
+    and the splits are views on it rather than copies. `fractions` gives the
+    share of rows in the train, validation and test splits.
+
+    With `shuffle` or `stratify` (one label per row), a single index array is
+    computed from a seeded permutation the first time it is needed, and the
+    splits and folds become index-backed views over it. Either way,
+    `iter_batches` reads any split in batches.
     """
 
-    def __init__(self, adaptee: AdapteeDataLoader) -> None:
+    def __init__(
+        self,
+        adaptee: AdapteeDataLoader,
+        fractions: Tuple[float, float, float] = (1 / 3, 1 / 3, 1 / 3),
+        shuffle: bool = False,
+        stratify: Optional[Sequence] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if len(fractions) != 3 or any(fraction < 0 for fraction in fractions):
+            raise ValueError("fractions must be three non-negative numbers")
+        if sum(fractions) > 1 + 1e-9:
+            raise ValueError("fractions must not sum to more than 1")
         self.adaptee = adaptee
-        self.all_data = adaptee.get_all_data()
+        self.fractions = fractions
+        self.shuffle = shuffle
+        self.stratify = stratify
+        self.seed = seed
 
-    def get_train_data(self) -> List[int]:
-        return self.all_data[:3]
+    @cached_property
+    def all_data(self) -> Sequence:
+        return self.adaptee.get_all_data()
 
-    def get_val_data(self) -> List[int]:
-        return self.all_data[3:6]
+    @cached_property
+    def n_rows(self) -> int:
+        return len(self.all_data)
 
-    def get_test_data(self) -> List[int]:
-        return self.all_data[6:9]
+    @cached_property
+    def order(self) -> Optional[np.ndarray]:
+        """
+        The row order the splits are cut from, or None for the natural order.
+
+        Stratification sorts rows by their relative position within their own
+        class, so every contiguous chunk of the order holds each class in
+        roughly its overall proportion.
+        """
+        if not self.shuffle and self.stratify is None:
+            return None
+
+        n_rows = self.n_rows
+        rng = np.random.default_rng(self.seed)
+        order = rng.permutation(n_rows) if self.shuffle else np.arange(n_rows)
+        if self.stratify is None:
+            return order
+
+        labels = np.asarray(self.stratify)
+        if len(labels) != n_rows:
+            raise ValueError("stratify must have one label per row")
+        _, classes, counts = np.unique(
+            labels[order], return_inverse=True, return_counts=True
+        )
+        by_class = np.argsort(classes, kind="stable")
+        class_starts = np.cumsum(counts) - counts
+        rank = np.empty(n_rows)
+        rank[by_class] = np.arange(n_rows) - np.repeat(class_starts, counts)
+        position = (rank + 0.5) / counts[classes]
+        return order[np.argsort(position, kind="stable")]
+
+    @cached_property
+    def boundaries(self) -> Tuple[int, int, int]:
+        n_rows = self.n_rows
+        train, val, test = self.fractions
+        # Round the cumulative fractions so that e.g. thirds of 9 rows give 3/3/3.
+        train_end = round(n_rows * train)
+        val_end = round(n_rows * (train + val))
+        test_end = round(n_rows * (train + val + test))
+        return train_end, val_end, min(test_end, n_rows)
+
+    def _split(self, start: int, stop: int) -> Sequence:
+        if self.order is None:
+            return make_view(self.all_data, start, stop)
+        return DataView(self.all_data, self.order[start:stop])
+
+    def get_train_data(self) -> Sequence:
+        return self._split(0, self.boundaries[0])
+
+    def get_val_data(self) -> Sequence:
+        return self._split(self.boundaries[0], self.boundaries[1])
+
+    def get_test_data(self) -> Sequence:
+        return self._split(self.boundaries[1], self.boundaries[2])
+
+    def get_folds(self, k: int) -> Iterator[Tuple[DataView, DataView]]:
+        """
+        Yield `(train, val)` views for k-fold cross validation over all rows,
+        ignoring `fractions`. Each fold is a slice of the same index order, so
+        no index array is built per fold.
+        """
+        n_rows = self.n_rows
+        if not 2 <= k <= n_rows:
+            raise ValueError("k must be between 2 and the number of rows")
+        order = range(n_rows) if self.order is None else self.order
+        for fold in range(k):
+            start, stop = fold * n_rows // k, (fold + 1) * n_rows // k
+            train = IndexChain(order[:start], order[stop:])
+            yield DataView(self.all_data, train), DataView(
+                self.all_data, order[start:stop]
+            )
 
 
 def client_code(target: DataLoader) -> None:
@@ -73,3 +291,14 @@ if __name__ == "__main__":
     print("Client: But I can work with it via the Adapter:")
     adapter = Adapter(adaptee)
     client_code(adapter)
+    print("\n")
+
+    print("Client: And I can choose how the data is split:")
+    client_code(Adapter(adaptee, fractions=(0.6, 0.2, 0.2)))
+    print("\n")
+
+    print("Client: Or shuffle it with a seed and cross validate:")
+    shuffled = Adapter(adaptee, shuffle=True, seed=0)
+    client_code(shuffled)
+    for fold, (train, val) in enumerate(shuffled.get_folds(3)):
+        print(f"fold {fold}: train {train} val {val}")
@@ -0,0 +1,226 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from functools import cached_property
+from typing import Any, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from adapter import Adapter, client_code
+
+"""
+In production the data rarely sits in a Python list. These Adaptees read
+`.npy`, Arrow IPC and Parquet files, and the `Adapter` from `adapter.py` turns
+them into the same `DataLoader` interface. The files are memory mapped and the
+splits stay NumPy or Arrow buffers, so nothing is converted to Python objects.
+
+pyarrow comes with the `columnar` extra: `poetry install --extras columnar`.
+"""
+
+
+class NpyDataLoader:
+    """
+    A `.npy` file opened as a read-only memmap. Slicing it gives views on the
+    mapping, so only the pages a split touches are ever read.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get_all_data(self) -> np.ndarray:
+        return np.load(self.path, mmap_mode="r")
+
+
+class ArrowDataLoader:
+    """
+    An Arrow IPC file read zero-copy from a memory map.
+    """
+
+    def __init__(self, path: str, columns: Optional[List[str]] = None) -> None:
+        self.path = path
+        self.columns = columns
+
+    def get_all_data(self) -> pa.Table:
+        with pa.memory_map(self.path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.select(self.columns) if self.columns else table
+
+
+class ParquetDataLoader:
+    """
+    A Parquet file. Reading all of it is only needed for shuffled splits; the
+    `ParquetAdapter` reads contiguous splits row group by row group.
+    """
+
+    def __init__(self, path: str, columns: Optional[List[str]] = None) -> None:
+        self.path = path
+        self.columns = columns
+
+    def get_all_data(self) -> pa.Table:
+        return pq.read_table(self.path, columns=self.columns, memory_map=True)
+
+
+class ParquetAdapter(Adapter):
+    """
+    Contiguous splits only read the row groups that overlap them, and only the
+    requested columns. The row count comes from the file footer, so nothing is
+    read until a split is requested.
+    """
+
+    @cached_property
+    def parquet_file(self) -> pq.ParquetFile:
+        return pq.ParquetFile(self.adaptee.path, memory_map=True)
+
+    @cached_property
+    def n_rows(self) -> int:
+        return self.parquet_file.metadata.num_rows
+
+    def _split(self, start: int, stop: int) -> Any:
+        if self.order is not None:
+            return super()._split(start, stop)
+
+        metadata = self.parquet_file.metadata
+        row_groups, first_row, group_start = [], None, 0
+        for index in range(metadata.num_row_groups):
+            group_stop = group_start + metadata.row_group(index).num_rows
+            if group_start < stop and start < group_stop:
+                row_groups.append(index)
+                first_row = group_start if first_row is None else first_row
+            group_start = group_stop
+        if not row_groups:
+            return self.parquet_file.schema_arrow.empty_table()
+
+        table = self.parquet_file.read_row_groups(
+            row_groups, columns=self.adaptee.columns
+        )
+        return table.slice(start - first_row, stop - start)
+
+
+class ListDataLoader:
+    """
+    A plain Python list of a configurable size.
+    """
+
+    def __init__(self, n_rows: int) -> None:
+        self.n_rows = n_rows
+
+    def get_all_data(self) -> List[int]:
+        return list(range(self.n_rows))
+
+
+class ListSlicingAdapter(Adapter):
+    """
+    The original list-based path, where every split is a sliced copy of the
+    list. It is the baseline the columnar adapters are compared against.
+    """
+
+    def _split(self, start: int, stop: int) -> List[int]:
+        return self.all_data[start:stop]
+
+
+def consume(split: Any) -> int:
+    if hasattr(split, "__array_interface__"):
+        return int(split.sum())
+    if isinstance(split, pa.Table):
+        return pc.sum(split.column(0)).as_py()
+    return sum(split)
+
+
+ADAPTERS = {
+    "npy": lambda data_dir, n_rows: Adapter(
+        NpyDataLoader(os.path.join(data_dir, "data.npy"))
+    ),
+    "arrow": lambda data_dir, n_rows: Adapter(
+        ArrowDataLoader(os.path.join(data_dir, "data.arrow"), ["value"])
+    ),
+    "parquet": lambda data_dir, n_rows: ParquetAdapter(
+        ParquetDataLoader(os.path.join(data_dir, "data.parquet"), ["value"])
+    ),
+    "list": lambda data_dir, n_rows: ListSlicingAdapter(ListDataLoader(n_rows)),
+}
+
+
+def _memory_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def benchmark(name: str, data_dir: str, n_rows: int) -> None:
+    """
+    Time fetching and reducing all three splits. This runs in a fresh process
+    per adapter, with the peak RSS reset first (Linux only), so the growth of
+    the peak over the starting RSS belongs to that adapter alone. Pages of a
+    memory-mapped file count once they are touched.
+    """
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+    start_rss = _memory_mb("VmRSS")
+    start = time.perf_counter()
+    adapter = ADAPTERS[name](data_dir, n_rows)
+    total = sum(
+        consume(split)
+        for split in (
+            adapter.get_train_data(),
+            adapter.get_val_data(),
+            adapter.get_test_data(),
+        )
+    )
+    elapsed = time.perf_counter() - start
+    rss_growth = _memory_mb("VmHWM") - start_rss
+    print(f"{name:<8} {elapsed:8.3f}s  peak RSS +{rss_growth:8.1f} MB  sum {total}")
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--benchmark"]:
+    benchmark(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+
+elif __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    values = np.arange(n_rows, dtype=np.int64)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        npy_path = os.path.join(data_dir, "data.npy")
+        arrow_path = os.path.join(data_dir, "data.arrow")
+        parquet_path = os.path.join(data_dir, "data.parquet")
+
+        table = pa.table({"value": values, "label": values % 2})
+        np.save(npy_path, values)
+        with pa.OSFile(arrow_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        pq.write_table(table, parquet_path, row_group_size=1_000_000)
+        del values, table
+
+        small_table = pa.table({"value": np.arange(10)})
+        small_npy_path = os.path.join(data_dir, "small.npy")
+        small_parquet_path = os.path.join(data_dir, "small.parquet")
+        np.save(small_npy_path, small_table["value"].to_numpy())
+        pq.write_table(small_table, small_parquet_path, row_group_size=4)
+
+        print("Client: Small files work like any other DataLoader:")
+        client_code(Adapter(NpyDataLoader(small_npy_path)))
+        print("\n")
+
+        print("Client: Parquet files can be shuffled too:")
+        client_code(
+            ParquetAdapter(
+                ParquetDataLoader(small_parquet_path, ["value"]), shuffle=True, seed=0
+            )
+        )
+        print("\n", flush=True)
+
+        print(
+            f"Client: Reading and reducing all splits of {n_rows:,} rows:", flush=True
+        )
+        for name in ADAPTERS:
+            subprocess.run(
+                [sys.executable, __file__, "--benchmark", name, data_dir, str(n_rows)],
+                check=True,
+            )
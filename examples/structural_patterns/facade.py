@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
 
 class Facade:
     """
@@ -36,6 +41,199 @@ class Facade:
         return "\n".join(results)
 
 
+class AsyncFacade(Facade):
+    """
+    The async Facade runs subsystem calls concurrently and only waits where
+    there is a real dependency: the model is trained on the data. Both
+    notifications run alongside the training work instead of in front of it.
+
+    The async entry points are `operation_async` and `operation_as_completed`;
+    the inherited `operation` still runs the subsystems one after another, so
+    an AsyncFacade keeps working with synchronous clients.
+
+    The subsystems are synchronous, so each call runs in a worker thread and is
+    given `timeout` seconds; a timed out call's thread is left to finish in the
+    background. A failing or timed out notification is reported as a result
+    line and never stops the training, while a failure of `get_data` or
+    `train_model` ends the operation.
+    """
+
+    def __init__(
+        self,
+        subsystem1: ModelTraining,
+        subsystem2: Notification,
+        timeout: Optional[float] = 10.0,
+    ) -> None:
+        super().__init__(subsystem1, subsystem2)
+        self.timeout = timeout
+
+    async def _call(self, method: Callable[[], str]) -> str:
+        return await asyncio.wait_for(asyncio.to_thread(method), self.timeout)
+
+    async def _after(self, task: asyncio.Task, method: Callable[[], str]) -> str:
+        await task
+        return await self._call(method)
+
+    async def _notify(self, method: Callable[[], str]) -> str:
+        try:
+            return await self._call(method)
+        except Exception as error:
+            return f"{method.__name__} failed: {type(error).__name__}"
+
+    def _start_training(
+        self, key: Hashable = None
+    ) -> Tuple[Awaitable[str], Awaitable[str]]:
+        get_data = asyncio.create_task(self._call(self._subsystem1.get_data))
+        train_model = asyncio.create_task(
+            self._after(get_data, self._subsystem1.train_model)
+        )
+        return get_data, train_model
+
+    async def _run(
+        self, get_data: Awaitable[str], train_model: Awaitable[str]
+    ) -> AsyncIterator[str]:
+        tasks = [
+            asyncio.create_task(self._notify(self._subsystem2.notify_user)),
+            get_data,
+            train_model,
+            asyncio.create_task(self._notify(self._subsystem2.update_training_status)),
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def operation_as_completed(self, key: Hashable = None) -> AsyncIterator[str]:
+        """
+        Yield each subsystem result as soon as it is ready. `key` identifies
+        the inputs of the training run; this Facade runs every request anyway,
+        but subclasses may share runs with the same key.
+        """
+
+        async for result in self._run(*self._start_training(key)):
+            yield result
+
+    async def operation_async(self, key: Hashable = None) -> str:
+        results = ["Facade initializes subsystems:"]
+        async for result in self.operation_as_completed(key):
+            results.append(result)
+        return "\n".join(results)
+
+
+class CachingFacade(AsyncFacade):
+    """
+    Many clients ask for the same training run. This Facade lets them share
+    it: requests for the same `key` that arrive within `window` seconds, or
+    while that run is still in flight, are served by a single `get_data` and
+    `train_model` call. Finished runs are kept in an LRU cache of `maxsize`
+    entries for `ttl` seconds. Notifications still go out for every request.
+
+    Waiting for the window is not free: every cache miss, even a lone request,
+    waits `window` seconds before `get_data` starts. `stats` counts requests,
+    cache hits, coalesced requests and real subsystem runs, to tune `window`
+    against that added latency.
+
+    The synchronous `operation` uses the same cache, but runs one request at
+    a time, so only the async entry points coalesce.
+    """
+
+    def __init__(
+        self,
+        subsystem1: ModelTraining,
+        subsystem2: Notification,
+        timeout: Optional[float] = 10.0,
+        window: float = 0.01,
+        maxsize: int = 128,
+        ttl: float = 60.0,
+    ) -> None:
+        super().__init__(subsystem1, subsystem2, timeout)
+        self.window = window
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "runs": 0}
+        self._cache: OrderedDict[Hashable, Tuple[float, str, str]] = OrderedDict()
+        self._pending: Dict[Hashable, Tuple[asyncio.Task, asyncio.Task]] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        return self.stats["hits"] / max(self.stats["requests"], 1)
+
+    @property
+    def coalescing_rate(self) -> float:
+        return self.stats["coalesced"] / max(self.stats["requests"], 1)
+
+    async def _get_data_after_window(self) -> str:
+        await asyncio.sleep(self.window)
+        return await self._call(self._subsystem1.get_data)
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[str, str]]:
+        self.stats["requests"] += 1
+        cached = self._cache.get(key)
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        self.stats["hits"] += 1
+        self._cache.move_to_end(key)
+        return cached[1], cached[2]
+
+    def _remember(self, key: Hashable, data: str, model: str) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl, data, model)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def operation(self, key: Hashable = None) -> str:
+        cached = self._lookup(key)
+        if cached is None:
+            self.stats["runs"] += 1
+            cached = (self._subsystem1.get_data(), self._subsystem1.train_model())
+            self._remember(key, *cached)
+
+        results = []
+        results.append("Facade initializes subsystems:")
+        results.append(self._subsystem2.notify_user())
+        results.extend(cached)
+        results.append(self._subsystem2.update_training_status())
+        return "\n".join(results)
+
+    def _start_training(
+        self, key: Hashable = None
+    ) -> Tuple[Awaitable[str], Awaitable[str]]:
+        cached = self._lookup(key)
+        if cached is not None:
+            return _resolved(cached[0]), _resolved(cached[1])
+
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["runs"] += 1
+            get_data = asyncio.create_task(self._get_data_after_window())
+            train_model = asyncio.create_task(
+                self._after(get_data, self._subsystem1.train_model)
+            )
+            train_model.add_done_callback(lambda _: self._store(key))
+            self._pending[key] = (get_data, train_model)
+
+        # Shield the shared run, so one client giving up does not cancel it
+        # for the others.
+        get_data, train_model = self._pending[key]
+        return asyncio.shield(get_data), asyncio.shield(train_model)
+
+    def _store(self, key: Hashable) -> None:
+        get_data, train_model = self._pending.pop(key)
+        if train_model.cancelled() or train_model.exception() is not None:
+            return
+
+        self._remember(key, get_data.result(), train_model.result())
+
+
+def _resolved(value: str) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
 class ModelTraining:
     """
     The Subsystem can accept requests either from the facade or client directly.
@@ -77,6 +275,16 @@ def client_code(facade: Facade) -> None:
     print(facade.operation())
 
 
+async def async_client_code(facade: AsyncFacade) -> None:
+    """
+    The async client sees the same kind of interface, but gets each result as
+    soon as its subsystem call finishes.
+    """
+
+    async for result in facade.operation_as_completed():
+        print(result)
+
+
 if __name__ == "__main__":
     # The client code may have some of the subsystem's objects already created.
     # In this case, it might be worthwhile to initialize the Facade with these
@@ -91,3 +299,36 @@ if __name__ == "__main__":
     # Get data
     # Train model
     # Update training status
+
+    print("\n")
+
+    # The async Facade gives the same results, in the order they complete.
+    asyncio.run(async_client_code(AsyncFacade(subsystem1, subsystem2)))
+
+    print("\n")
+
+    # A notification that times out is reported, but the training still
+    # finishes.
+    class SlowNotification(Notification):
+        def notify_user(self) -> str:
+            time.sleep(0.5)
+            return "Notify user"
+
+    slow_facade = AsyncFacade(subsystem1, SlowNotification(), timeout=0.1)
+    asyncio.run(async_client_code(slow_facade))
+
+    print("\n")
+
+    # Clients asking for the same run share one training call, and later
+    # requests are answered from the cache.
+    async def many_clients(facade: CachingFacade) -> None:
+        await asyncio.gather(*(facade.operation_async() for _ in range(10)))
+        await facade.operation_async()
+        print(f"Caching Facade stats: {facade.stats}")
+
+    caching_facade = CachingFacade(subsystem1, subsystem2)
+    asyncio.run(many_clients(caching_facade))
+
+    # Synchronous clients share the same cache.
+    client_code(caching_facade)
+    print(f"Caching Facade stats: {caching_facade.stats}")